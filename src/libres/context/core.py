@@ -3,8 +3,7 @@ from __future__ import annotations
 import enum
 import libres
 import threading
-from contextlib import contextmanager
-from functools import cached_property
+from functools import cache, cached_property
 
 from libres.modules import errors
 
@@ -14,12 +13,12 @@ from typing import Literal
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from collections.abc import Callable
-    from collections.abc import Iterator
     from sqlalchemy.orm import Session
     from sqlalchemy.orm.session import SessionTransaction
     from typing_extensions import TypeAlias
     from uuid import UUID
 
+    from libres.context.registry import ContextSwitch
     from libres.context.registry import Registry
     from libres.context.session import SessionProvider
     from libres.db.models import Allocation
@@ -36,6 +35,16 @@ missing: missing_t = _Marker.missing
 required: required_t = _Marker.required
 
 
+@cache
+def _service_ids(name: str) -> tuple[str, str]:
+    """ Returns the keys of the service and of its cache marker. Service
+    names are a small, fixed set, so the keys are only ever built once per
+    name.
+
+    """
+    return f'service/{name}', f'service/{name}/cache'
+
+
 class StoppableService:
     """ Services inheriting from this class have their stop_service method
     called when the service is discarded.
@@ -91,12 +100,14 @@ class ContextServicesMixin:
 
     @property
     def session_provider(self) -> SessionProvider:
+        # not cached, so replacing the provider on the context takes effect
+        # right away - the cached instance is a dictionary lookup anyway
         return self.context.get_service('session_provider')  # type: ignore[no-any-return]
 
     @property
     def session(self) -> Session:
         """ Returns the current session. """
-        return self.session_provider.session()  # type: ignore[no-any-return]
+        return self.session_provider.session()
 
     def close(self) -> None:
         """ Closes the current session. """
@@ -157,16 +168,18 @@ class Context:
         self.registry = registry or libres.registry
         self.values: dict[str, Any] = {}
         self.parent = parent
+
+        # the service instances cached by this context, which are never
+        # inherited, unlike the values (see :meth:`get_service`)
+        self.cached_services: dict[str, Any] = {}
         self.locked = False
         self.thread_lock = threading.RLock()
 
     def __repr__(self) -> str:
         return f"<Libres Context(name='{self.name}')>"
 
-    @contextmanager
-    def as_current_context(self) -> Iterator[None]:
-        with self.registry.context(self.name):
-            yield
+    def as_current_context(self) -> ContextSwitch:
+        return self.registry.context(self.name)
 
     def switch_to(self) -> None:
         self.registry.switch_context(self.name)
@@ -180,8 +193,10 @@ class Context:
             self.locked = False
 
     def get(self, key: str) -> Any | missing_t:
-        if key in self.values:
-            return self.values[key]
+        value = self.values.get(key, missing)
+
+        if value is not missing:
+            return value
         elif self.parent:
             return self.parent.get(key)
         else:
@@ -209,25 +224,32 @@ class Context:
             self.set(f'settings.{name}', value)
 
     def get_service(self, name: str) -> Any:
-        service_id = f'service/{name}'
+        service_id, cache_id = _service_ids(name)
         service = self.get(service_id)
 
         if service is missing:
             raise errors.UnknownService(service_id)
 
-        cache_id = f'service/{name}/cache'
-        cache = self.get(cache_id)
-
         # no cache
-        if cache is missing:
+        if self.get(cache_id) is not required:
             return service(self)
-        else:
-            # first call, cache it!
-            if cache is required:
-                self.set(cache_id, service(self))
 
+        # the instance is cached on the context that asks for it, as a
+        # parent's instance was created with the parent's settings
+        try:
             # nth call, use cached value
-            return self.get(cache_id)
+            return self.cached_services[name]
+        except KeyError:
+            pass
+
+        # first call, cache it!
+        with self.thread_lock:
+            # caching an instance is not a change to the context, so
+            # this is allowed even if the context is locked
+            if name not in self.cached_services:
+                self.cached_services[name] = service(self)
+
+            return self.cached_services[name]
 
     def set_service(
         self,
@@ -236,9 +258,16 @@ class Context:
         cache: bool = False
     ) -> None:
         with self.thread_lock:
-            service_id = f'service/{name}'
+            service_id, cache_id = _service_ids(name)
             self.set(service_id, factory)
 
+            # without cache=True the factory is cached if the parent
+            # context caches the service
             if cache:
-                cache_id = f'service/{name}/cache'
                 self.set(cache_id, required)
+
+            # an instance cached for the previous factory is stale
+            stale = self.cached_services.pop(name, None)
+
+            if isinstance(stale, StoppableService):
+                stale.stop_service()
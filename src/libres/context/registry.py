@@ -2,8 +2,6 @@ from __future__ import annotations
 
 import threading
 
-from contextlib import contextmanager
-
 from libres.modules import errors
 from libres.context.core import Context
 
@@ -11,7 +9,7 @@ from libres.context.core import Context
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from collections.abc import Callable
-    from collections.abc import Iterator
+    from types import TracebackType
     from uuid import UUID
 
 
@@ -35,8 +33,10 @@ def create_default_registry() -> Registry:
     def email_validator_factory(context: Context) -> Callable[[str], bool]:
         # A very simple and stupid email validator. It's way too simple, but
         # it can be extended to do more powerful checks.
+        email_pattern = re.compile(r'[^@]+@[^@]+\.[^@]+')
+
         def is_valid_email(email: str) -> bool:
-            return bool(re.match(r'[^@]+@[^@]+\.[^@]+', email))
+            return email_pattern.match(email) is not None
 
         return is_valid_email
 
@@ -44,16 +44,19 @@ def create_default_registry() -> Registry:
         return Exposure()
 
     def uuid_generator_factory(context: Context) -> Callable[[str], UUID]:
+        # the namespace is resolved once per generator instead of on every
+        # generated uuid - the generator is not cached on the context, so a
+        # new scheduler (or clear_cache) picks up a changed namespace
+        namespace = context.get_setting('uuid_namespace')
+        prefix = context.name
+
         def uuid_generator(name: str) -> UUID:
-            return new_namespace_uuid(
-                context.get_setting('uuid_namespace'),
-                f'{context.name}/{name}'
-            )
+            return new_namespace_uuid(namespace, f'{prefix}/{name}')
         return uuid_generator
 
     master = registry.master_context
     assert master is not None
-    master.set_service('email_validator', email_validator_factory)
+    master.set_service('email_validator', email_validator_factory, cache=True)
     master.set_service('session_provider', session_provider, cache=True)
     master.set_service('exposure', exposure_factory)
     master.set_service('uuid_generator', uuid_generator_factory)
@@ -65,6 +68,40 @@ def create_default_registry() -> Registry:
     return registry
 
 
+class ContextSwitch:
+    """ Switches the current context of a registry for the duration of a
+    with block. Returned by :meth:`Registry.context`.
+
+    The previously active context is restored on exit, even if an
+    exception was raised inside the block. Each switch keeps the context
+    it replaced, so nested switches unwind like a stack, without having
+    to look up the previous context by name again.
+
+    """
+
+    __slots__ = ('registry', 'name', 'previous')
+
+    previous: Context
+
+    def __init__(self, registry: Registry, name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self) -> Context:
+        registry = self.registry
+        self.previous = registry.current_context
+        registry.switch_context(self.name)
+        return registry.local.current_context  # type: ignore[no-any-return]
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+        self.registry.local.current_context = self.previous
+
+
 class Registry:
     """ Holds a number of contexts, managing their creation and defining
     the currently active context.
@@ -82,7 +119,7 @@ class Registry:
     """
 
     contexts: dict[str, Context]
-    master_context: Context | None = None
+    master_context: Context | None
 
     def __init__(self) -> None:
         self.thread_lock = threading.RLock()
@@ -91,14 +128,21 @@ class Registry:
             self.contexts = {}
             self.local = threading.local()
 
-        self.master_context = self.register_context('master')
+            # the master context is the parent of all other contexts,
+            # it is registered first and has no parent of its own
+            self.master_context = None
+            self.master_context = self.register_context('master')
 
     @property
     def current_context(self) -> Context:
-        if not hasattr(self.local, 'current_context'):
-            self.local.current_context = self.master_context
-
-        return self.local.current_context  # type: ignore[no-any-return]
+        try:
+            return self.local.current_context  # type: ignore[no-any-return]
+        except AttributeError:
+            # first access on this thread
+            context = self.master_context
+            assert context is not None
+            self.local.current_context = context
+            return context
 
     def is_existing_context(self, name: str) -> bool:
         return name in self.contexts
@@ -137,23 +181,21 @@ class Registry:
 
     def switch_context(self, name: str) -> None:
         with self.thread_lock:
-            self.assert_exists(name)
             self.local.current_context = self.get_context(name)
 
-    @contextmanager
-    def context(self, name: str) -> Iterator[Context]:
-        previous = self.current_context.name
-        self.switch_context(name)
-        yield self.current_context
-        self.switch_context(previous)
+    def context(self, name: str) -> ContextSwitch:
+        return ContextSwitch(self, name)
 
     def get_current_context(self) -> Context:
         return self.current_context
 
     def get_context(self, name: str, autocreate: bool = False) -> Context:
-        if not autocreate:
-            self.assert_exists(name)
-        elif not self.is_existing_context(name):
-            self.register_context(name)
+        context = self.contexts.get(name)
+
+        if context is None:
+            if not autocreate:
+                raise errors.UnknownContext
+
+            context = self.register_context(name)
 
-        return self.contexts[name]
+        return context
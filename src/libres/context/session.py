@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import threading
+
 from sqlalchemy import create_engine
 from sqlalchemy.pool import QueuePool
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import sessionmaker
 
 from libres.context.core import StoppableService
 
 
 from typing import Any
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session
 
 
 SERIALIZABLE = 'SERIALIZABLE'
@@ -21,6 +27,14 @@ class SessionProvider(StoppableService):
     If you don't do that, libres might run into errors as it assumes and tests
     against SERIALIZABLE connections!
 
+    The engine is only created once a session is requested for the first
+    time. This is also when the postgres version is checked.
+
+    By default the engine uses a :class:`~sqlalchemy.pool.QueuePool` which
+    keeps up to five idle connections around. Pass a different ``poolclass``
+    through ``engine_config`` (e.g. :class:`~sqlalchemy.pool.NullPool`) if
+    connections should not be kept open between transactions.
+
     """
 
     def __init__(
@@ -29,18 +43,74 @@ class SessionProvider(StoppableService):
         engine_config: dict[str, Any] | None = None,
         session_config: dict[str, Any] | None = None
     ):
-        self.assert_valid_postgres_version(dsn)
         self.dsn = dsn
+        self.engine_config = engine_config or {}
+        self.session_config = session_config or {}
+
+        # each thread gets its own session, which is kept around for the
+        # lifetime of the thread (or until the provider is stopped)
+        self._threadstore = threading.local()
+
+        # the engine and the session factory are shared by all threads,
+        # the lock makes sure that only one of them creates each
+        self._lock = threading.RLock()
+        self._engine: Engine | None = None
+        self._session_factory: sessionmaker | None = None
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._engine = self._create_engine()
+
+        return self._engine
+
+    def _create_engine(self) -> Engine:
+        self.assert_valid_postgres_version(self.dsn)
+
+        config = dict(self.engine_config)
+        config.setdefault('isolation_level', SERIALIZABLE)
+
+        # the pool size options are only understood by the QueuePool
+        if config.setdefault('poolclass', QueuePool) is QueuePool:
+            config.setdefault('pool_size', 5)
+            config.setdefault('max_overflow', 5)
 
-        self.engine = create_engine(
-            dsn, poolclass=QueuePool, pool_size=5, max_overflow=5,
-            isolation_level=SERIALIZABLE,
-            **(engine_config or {})
-        )
+        return create_engine(self.dsn, **config)
 
-        self.session = scoped_session(sessionmaker(
-            bind=self.engine, **(session_config or {})
-        ))
+    @property
+    def session_factory(self) -> sessionmaker:
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    self._session_factory = sessionmaker(
+                        bind=self.engine, **self.session_config
+                    )
+
+        return self._session_factory
+
+    def session(self) -> Session:
+        """ Returns the session of the current thread, creating it on
+        first access.
+
+        """
+        try:
+            return self._threadstore.session  # type: ignore[no-any-return]
+        except AttributeError:
+            session: Session = self.session_factory()
+            self._threadstore.session = session
+            return session
+
+    def remove_session(self) -> None:
+        """ Closes and discards the session of the current thread, if there
+        is one. The next call to :meth:`session` creates a new session.
+
+        """
+        session = self._threadstore.__dict__.pop('session', None)
+
+        if session is not None:
+            session.close()
 
     def stop_service(self) -> None:
         """ Called by the libres context when the session provider is being
@@ -51,7 +121,11 @@ class SessionProvider(StoppableService):
 
         """
 
-        self.session().close()
+        # nothing to clean up if the engine was never used
+        if self._engine is None:
+            return
+
+        self.remove_session()
         self.engine.raw_connection().invalidate()
         self.engine.dispose()
 
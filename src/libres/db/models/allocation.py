@@ -4,6 +4,7 @@ import sedate
 
 from datetime import datetime, timedelta, time
 from itertools import groupby
+from sqlalchemy import func
 from sqlalchemy import types
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.schema import Column
@@ -447,6 +448,10 @@ class Allocation(TimestampMixin, ORMBase, OtherModels):
 
         """
         timezone = timezone or self.timezone
+        assert timezone is not None
+
+        # resolve the timezone once, rather than for each conversion below
+        timezone = sedate.ensure_timezone(timezone)
 
         if self.partly_available:
             assert isinstance(start, time)
@@ -495,7 +500,9 @@ class Allocation(TimestampMixin, ORMBase, OtherModels):
 
     @property
     def waitinglist_length(self) -> int:
-        return self.pending_reservations.count()
+        # count directly, rather than wrapping the query in a subquery
+        query = self.pending_reservations.with_entities(func.count())
+        return query.scalar()  # type: ignore[no-any-return]
 
     @property
     def availability(self) -> float:
@@ -760,7 +767,7 @@ class Allocation(TimestampMixin, ORMBase, OtherModels):
         partitions = []
         total = 0.0
 
-        for flag, group in groupby(pieces, key=lambda p: p):
+        for flag, group in groupby(pieces):
             percentage = sum(1 for item in group) * step
             partitions.append((percentage, flag))
             total += percentage
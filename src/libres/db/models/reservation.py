@@ -119,6 +119,9 @@ class Reservation(TimestampMixin, ORMBase, OtherModels):
 
     __table_args__ = (
         Index('target_status_ix', 'status', 'target', 'id'),
+        Index(
+            'session_status_ix', 'session_id', 'status', 'created', 'modified'
+        ),
     )
 
     __mapper_args__ = {
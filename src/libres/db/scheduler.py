@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import sedate
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, time, timedelta
 from operator import attrgetter
 from sqlalchemy import func
-from sqlalchemy.orm import exc
 from sqlalchemy.sql import and_, not_
 from uuid import uuid4 as new_uuid, UUID
 
@@ -155,10 +155,13 @@ class Scheduler(ContextServicesMixin):
         self,
         dates: utils._NestedIterable[datetime]
     ) -> list[tuple[datetime, datetime]]:
+        # look up the timezone once, not once for each date
+        timezone = sedate.ensure_timezone(self.timezone)
+
         return [
             (
-                sedate.standardize_date(s, self.timezone),
-                sedate.standardize_date(e, self.timezone)
+                sedate.standardize_date(s, timezone),
+                sedate.standardize_date(e, timezone)
             ) for s, e in utils.pairs(dates)
         ]
 
@@ -167,9 +170,11 @@ class Scheduler(ContextServicesMixin):
         start: datetime,
         end: datetime
     ) -> tuple[datetime, datetime]:
+        timezone = sedate.ensure_timezone(self.timezone)
+
         return (
-            sedate.standardize_date(start, self.timezone),
-            sedate.standardize_date(end, self.timezone)
+            sedate.standardize_date(start, timezone),
+            sedate.standardize_date(end, timezone)
         )
 
     def managed_allocations(self) -> Query[Allocation]:
@@ -494,34 +499,53 @@ class Scheduler(ContextServicesMixin):
             return []
 
         for start, end in rasterized_dates:
-            if sedate.count_overlaps(rasterized_dates, start, end) > 1:
-                raise errors.InvalidAllocationError
             if end < start:
                 raise errors.InvalidAllocationError
 
+        # ordered by start, a range overlaps another one if it starts before
+        # the previous range ends (which is the latest end so far, since the
+        # ranges before it did not overlap)
+        # (the order keeps the index of each range as it was passed in)
+        order = sorted(
+            range(len(rasterized_dates)), key=rasterized_dates.__getitem__
+        )
+        sorted_dates = [rasterized_dates[ix] for ix in order]
+
+        previous_end: datetime | None = None
+        for start, end in sorted_dates:
+            if previous_end is not None and start <= previous_end:
+                raise errors.InvalidAllocationError
+
+            previous_end = end
+
         # Make sure that this span does not overlap another master
-        skipped = set()
+        skipped: set[tuple[datetime, datetime]] = set()
+
+        # without overlaps the ranges are ordered by their ends as well
+        starts = [start for start, end in sorted_dates]
+        ends = [end for start, end in sorted_dates]
 
         # Find existing overlapping (master) allocations
         query = self.managed_allocations()
         query = self.queries.overlapping_allocations(query, rasterized_dates)
         query = query.filter(Allocation.resource == self.resource)
         for existing in query:
-            # we are doing a bit of redundant work here, since the
-            # query doesn't tell us which range(s) the existing
-            # allocation overlaps with
-            for start, end in rasterized_dates:
-                if not sedate.overlaps(
-                    start, end,
-                    existing.start, existing.end
-                ):
-                    continue
+            # the query doesn't tell us which range(s) the existing
+            # allocation overlaps with, but those form a contiguous run
+            # of the ordered ranges, which we find by bisecting
+            first = bisect_left(ends, existing.start)
+            last = bisect_right(starts, existing.end)
+            overlapping = order[first:last]
+
+            if not overlapping:
+                continue
+
+            if not skip_overlapping:
+                # report the first overlapping range the caller passed in
+                start, end = rasterized_dates[min(overlapping)]
+                raise errors.OverlappingAllocationError(start, end, existing)
 
-                if not skip_overlapping:
-                    raise errors.OverlappingAllocationError(
-                        start, end, existing)
-                else:
-                    skipped.add((start, end))
+            skipped.update(rasterized_dates[ix] for ix in overlapping)
 
         # Write the master allocations
         allocations = []
@@ -636,6 +660,7 @@ class Scheduler(ContextServicesMixin):
         # get a map for resource_uuid -> allocation.id
         ids = {a.resource: a.id for a in allocations}
 
+        session = self.session
         for allocation in allocations:
 
             # change the quota for all allocations
@@ -654,7 +679,7 @@ class Scheduler(ContextServicesMixin):
                 # combination with the delete query below seems a bit
                 # unpredictable given the cascading of changes
 
-                query = self.session.query(ReservedSlot)
+                query = session.query(ReservedSlot)
                 query = query.filter(and_(
                     ReservedSlot.resource == slot.resource,
                     ReservedSlot.allocation_id == slot.allocation_id,
@@ -669,7 +694,7 @@ class Scheduler(ContextServicesMixin):
 
         # get rid of the unused allocations (always preserving the master)
         if unused:
-            query = self.session.query(Allocation)
+            query = session.query(Allocation)
             query = query.filter(Allocation.resource.in_(unused))
             query = query.filter(Allocation.id != master.id)
             query = query.filter(Allocation._start == master._start)
@@ -815,13 +840,15 @@ class Scheduler(ContextServicesMixin):
                             change.reserved_slots[0]
                         )
 
-                    if (
-                        change.is_master and
-                        change.pending_reservations.count()
-                    ):
-                        raise errors.AffectedPendingReservationError(
-                            change.pending_reservations[0]
-                        )
+                    if change.is_master:
+                        pending = change.pending_reservations.with_entities(
+                            Reservation
+                        ).first()
+
+                        if pending is not None:
+                            raise errors.AffectedPendingReservationError(
+                                pending
+                            )
 
         # the following attributes must be equal over all group members
         # (this still allows to use move_allocation to remove an allocation
@@ -894,14 +921,17 @@ class Scheduler(ContextServicesMixin):
                     allocation.reserved_slots[0]
                 )
 
-            if allocation.pending_reservations.count():
-                raise errors.AffectedPendingReservationError(
-                    allocation.pending_reservations[0]
-                )
+            pending = allocation.pending_reservations.with_entities(
+                Reservation
+            ).first()
 
+            if pending is not None:
+                raise errors.AffectedPendingReservationError(pending)
+
+        session = self.session
         for allocation in allocations:
             if not allocation.is_transient:
-                self.session.delete(allocation)
+                session.delete(allocation)
 
     def remove_unused_allocations(
         self,
@@ -1003,12 +1033,13 @@ class Scheduler(ContextServicesMixin):
 
         # we need to filter by weekday which we cannot easily do in SQL
         # so we fetch first and delete the allocations that match
+        session = self.session
         deleted = 0
         for allocation in allocations:
             if allocation.display_start().weekday() not in day_numbers:
                 continue
 
-            self.session.delete(allocation)
+            session.delete(allocation)
             deleted += 1
         return deleted
 
@@ -1284,8 +1315,7 @@ class Scheduler(ContextServicesMixin):
                 if (reservation.target, reservation.start) in found_set:
                     raise errors.OverlappingReservationError
 
-        for reservation in reservations:
-            self.session.add(reservation)
+        self.session.add_all(reservations)
 
         events.on_reservations_made(self.context, reservations)
 
@@ -1298,6 +1328,7 @@ class Scheduler(ContextServicesMixin):
 
         # write out the slots
         slots_to_reserve = []
+        session = self.session
 
         dates: tuple[_dtrange, ...] | list[_dtrange]
         if reservation.target_type == 'group':
@@ -1332,7 +1363,7 @@ class Scheduler(ContextServicesMixin):
                 # the allocation may be a fake one, in which case we
                 # must make it realz yo
                 if allocation.is_transient:
-                    self.session.add(allocation)
+                    session.add(allocation)
 
         reservation.status = 'approved'
 
@@ -1399,18 +1430,19 @@ class Scheduler(ContextServicesMixin):
 
         """
 
+        session = self.session
         slots = self.reserved_slots_by_reservation(token, id).all()
 
         for slot in slots:
-            self.session.delete(slot)
+            session.delete(slot)
 
         reservations = self.reservations_by_token(token, id).all()
 
         for reservation in reservations:
-            self.session.delete(reservation)
+            session.delete(reservation)
 
         # some allocations still reference reserved_slots if not for this
-        self.session.expire_all()
+        session.expire_all()
 
         events.on_reservations_removed(self.context, reservations)
 
@@ -1827,6 +1859,10 @@ class Scheduler(ContextServicesMixin):
         token: UUID,
         id: int | None = None
     ) -> Query[Reservation]:
+        """ Returns the reservations of the given token (and id). The query
+        is empty if the token is unknown, no error is raised.
+
+        """
 
         query = self.managed_reservations()
         query = query.filter(Reservation.token == token)
@@ -1834,9 +1870,4 @@ class Scheduler(ContextServicesMixin):
         if id:
             query = query.filter(Reservation.id == id)
 
-        try:
-            query.first()
-        except exc.NoResultFound:
-            raise errors.InvalidReservationToken from None
-
         return query
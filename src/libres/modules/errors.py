@@ -91,7 +91,11 @@ class NoReservationsToConfirm(LibresError):
 
 
 class InvalidReservationToken(LibresError):
-    pass
+    """ Deprecated, no longer raised by libres. Unknown tokens result in
+    empty queries, see
+    :meth:`~libres.db.scheduler.Scheduler.reservations_by_token`.
+
+    """
 
 
 class OverlappingAllocationError(LibresError):
@@ -1,14 +1,41 @@
 import pytest
-from _pytest.fixtures import FixtureLookupError
 
 from libres import new_scheduler, registry
+from libres.context.session import SessionProvider
+from libres.db.models import ORMBase
+from libres.modules import events
+from secrets import token_hex
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from testing.postgresql import Postgresql
-from uuid import uuid4 as new_uuid
+
+
+_EVENT_LISTS = tuple(
+    getattr(events, name) for name in dir(events) if name.startswith('on_')
+)
+
+# the test database is thrown away afterwards, so durability is not needed
+_POSTGRES_ARGS = ' '.join((
+    Postgresql.DEFAULT_SETTINGS['postgres_args'],
+    '-c synchronous_commit=off',
+    '-c full_page_writes=off',
+    '-c wal_level=minimal',
+    '-c max_wal_senders=0',
+    '-c checkpoint_timeout=30min',
+))
+
+# the cluster shared by all pytest-xdist workers
+_POSTGRES = pytest.StashKey[Postgresql]()
+
+# empties all libres tables in a single statement
+_TRUNCATE_ALL = 'TRUNCATE {} RESTART IDENTITY CASCADE'.format(
+    ', '.join(table.name for table in ORMBase.metadata.sorted_tables)
+)
 
 
 def new_test_scheduler(dsn, context=None, name=None):
-    context = context or new_uuid().hex
-    name = name or new_uuid().hex
+    context = context or token_hex(16)
+    name = name or token_hex(16)
 
     context = registry.register_context(context, replace=True)
     context.set_setting('dsn', dsn)
@@ -17,44 +44,104 @@ def new_test_scheduler(dsn, context=None, name=None):
 
 
 @pytest.fixture(scope="function")
-def scheduler(request, dsn):
+def scheduler(request, dsn, session_provider):
 
     # clear the events before each test
-    from libres.modules import events
-    for event in (e for e in dir(events) if e.startswith('on_')):
-        del getattr(events, event)[:]
-
-    try:
-        context = request.getfixturevalue('scheduler_context')
-    except FixtureLookupError:
-        context = None
+    for event in _EVENT_LISTS:
+        event.clear()
 
-    try:
-        name = request.getfixturevalue('scheduler_context')
-    except FixtureLookupError:
-        name = None
+    # tests may pick the context and name through indirect parametrization
+    scheduler = new_test_scheduler(dsn, **getattr(request, 'param', {}))
 
-    scheduler = new_test_scheduler(dsn, context, name)
+    # share the engine and its connection pool between tests
+    scheduler.context.set_service(
+        'session_provider', lambda context: session_provider, cache=True
+    )
 
     yield scheduler
 
     scheduler.rollback()
-    scheduler.extinguish_managed_records()
+    scheduler.session.execute(_TRUNCATE_ALL)
     scheduler.commit()
     scheduler.close()
-    scheduler.session_provider.stop_service()
+
+    # tests which replace the session provider leave the cleanup to us
+    if scheduler.session_provider is not session_provider:
+        scheduler.session_provider.stop_service()
+
+    # don't let the registry grow by one context per test
+    registry.contexts.pop(scheduler.context.name, None)
 
 
 @pytest.fixture(scope="session")
-def dsn():
-    postgres = Postgresql()
+def session_provider(dsn):
+    provider = SessionProvider(dsn)
+
+    yield provider
+
+    provider.stop_service()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """ Starts a single cluster on the pytest-xdist controller, which is
+    shared by all workers.
 
-    scheduler = new_test_scheduler(postgres.url())
+    """
+    postgres = node.config.stash.get(_POSTGRES, None)
+
+    if postgres is None:
+        postgres = Postgresql(postgres_args=_POSTGRES_ARGS)
+        node.config.stash[_POSTGRES] = postgres
+
+    node.workerinput['postgres_url'] = postgres.url()
+
+
+def pytest_unconfigure(config):
+    postgres = config.stash.get(_POSTGRES, None)
+
+    if postgres is not None:
+        postgres.stop()
+
+
+def create_worker_database(url, name):
+    """ Creates a database of the given name on the cluster behind the url
+    and returns the url of the new database.
+
+    """
+    engine = create_engine(url, isolation_level='AUTOCOMMIT')
+
+    try:
+        engine.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        engine.dispose()
+
+    return str(make_url(url).set(database=name))
+
+
+@pytest.fixture(scope="session")
+def dsn(request):
+    workerinput = getattr(request.config, 'workerinput', None)
+
+    # with pytest-xdist each worker gets its own database on the shared
+    # cluster, which keeps the table truncation after each test from
+    # affecting other workers
+    if workerinput is None:
+        postgres = Postgresql(postgres_args=_POSTGRES_ARGS)
+        url = postgres.url()
+    else:
+        postgres = None
+        url = create_worker_database(
+            workerinput['postgres_url'], workerinput['workerid']
+        )
+
+    scheduler = new_test_scheduler(url)
     scheduler.setup_database()
     scheduler.commit()
 
-    yield postgres.url()
+    yield url
 
     scheduler.close()
 
-    postgres.stop()
+    if postgres is not None:
+        postgres.stop()
@@ -1,13 +1,25 @@
 import pytest
 
-from datetime import datetime, time
+from datetime import datetime, time, timezone
 from libres.db.models import Allocation, ReservedSlot
 from libres.modules import errors
-from pytz import utc
 from sqlalchemy.exc import IntegrityError
 from uuid import uuid4 as new_uuid
 
 
+utc = timezone.utc
+
+# the (utc) datetimes used by the limit_timespan tests on 2014-01-01,
+# T2400 being the midnight at the end of that day
+T0000 = datetime(2014, 1, 1, 0, 0, tzinfo=utc)
+T0800 = datetime(2014, 1, 1, 8, 0, tzinfo=utc)
+T0830 = datetime(2014, 1, 1, 8, 30, tzinfo=utc)
+T0845 = datetime(2014, 1, 1, 8, 45, tzinfo=utc)
+T0900 = datetime(2014, 1, 1, 9, 0, tzinfo=utc)
+T1000 = datetime(2014, 1, 1, 10, 0, tzinfo=utc)
+T2400 = datetime(2014, 1, 2, 0, 0, tzinfo=utc)
+
+
 def test_add_allocation(scheduler):
 
     allocation = Allocation(raster=15, resource=scheduler.resource)
@@ -44,7 +56,7 @@ def test_get_master(scheduler):
     # the siblings must exist in the database for the query in get_master
     siblings = allocations[0].siblings()
     scheduler.session.add(siblings[1])
-    scheduler.commit()
+    scheduler.session.flush()
 
     assert siblings[1].get_master() is allocations[0]
     assert siblings[1].get_master().id == allocations[0].id
@@ -89,27 +101,50 @@ def test_date_functions(scheduler):
     assert not allocation.contains(start, end)
 
 
-def test_whole_day():
-    allocation = Allocation(
+@pytest.fixture(scope="function")
+def zurich_allocation():
+    return Allocation(
         raster=15, resource=new_uuid(), timezone='Europe/Zurich'
     )
 
-    # the whole-day is relative to the allocation's timezone
-    allocation.start = datetime(2013, 1, 1, 23, 0, tzinfo=utc)
-    allocation.end = datetime(2013, 1, 2, 23, 0, tzinfo=utc)
 
-    assert allocation.whole_day
+@pytest.fixture(scope="function")
+def partly_available_allocation():
+    return Allocation(
+        raster=15, resource=new_uuid(), partly_available=True, timezone='UTC'
+    )
 
-    allocation.start = datetime(2013, 1, 1, 23, 0, tzinfo=utc)
-    allocation.end = datetime(2013, 1, 2, 22, 59, 59, 999999, tzinfo=utc)
 
-    assert allocation.whole_day
+@pytest.fixture(scope="function")
+def not_partly_available_allocation():
+    return Allocation(
+        raster=15, resource=new_uuid(), partly_available=False, timezone='UTC'
+    )
 
-    allocation.start = datetime(2013, 1, 1, 23, 0, tzinfo=utc)
-    allocation.end = datetime(2013, 1, 2, 22, 59, 59, 999999, tzinfo=utc)
+
+@pytest.mark.parametrize('start,end', [
+    (
+        datetime(2013, 1, 1, 23, 0, tzinfo=utc),
+        datetime(2013, 1, 2, 23, 0, tzinfo=utc)
+    ),
+    (
+        datetime(2013, 1, 1, 23, 0, tzinfo=utc),
+        datetime(2013, 1, 2, 22, 59, 59, 999999, tzinfo=utc)
+    ),
+])
+def test_whole_day(zurich_allocation, start, end):
+    allocation = zurich_allocation
+
+    # the whole-day is relative to the allocation's timezone
+    allocation.start = start
+    allocation.end = end
 
     assert allocation.whole_day
 
+
+def test_whole_day_invalid_range(zurich_allocation):
+    allocation = zurich_allocation
+
     allocation.start = datetime(2013, 1, 1, 15, 0, tzinfo=utc)
     allocation.end = datetime(2013, 1, 1, 0, 0, tzinfo=utc)
 
@@ -147,84 +182,54 @@ def test_separate_allocation(scheduler):
     assert allocations[0].is_separate
 
 
-def test_limit_timespan():
+@pytest.mark.parametrize('start_time,end_time', [
+    (time(8, 0), time(9, 0)),
+    (time(7, 0), time(10, 0)),
+])
+def test_limit_timespan_not_partly_available(
+    not_partly_available_allocation, start_time, end_time
+):
+    allocation = not_partly_available_allocation
 
     # if not partly availabe the limit is always the same
-    allocation = Allocation(
-        raster=15, resource=new_uuid(), partly_available=False, timezone='UTC'
-    )
-
-    allocation.start = datetime(2014, 1, 1, 8, 0, tzinfo=utc)
-    allocation.end = datetime(2014, 1, 1, 9, 0, tzinfo=utc)
+    allocation.start = T0800
+    allocation.end = T0900
 
-    assert allocation.limit_timespan(time(8, 0), time(9, 0)) == (
+    assert allocation.limit_timespan(start_time, end_time) == (
         allocation.display_start(), allocation.display_end()
     )
 
-    assert allocation.limit_timespan(time(7, 0), time(10, 0)) == (
-        allocation.display_start(), allocation.display_end()
-    )
 
-    # if partly available, more complex things happen
-    allocation = Allocation(
-        raster=15, resource=new_uuid(), partly_available=True, timezone='UTC'
-    )
-
-    allocation.start = datetime(2014, 1, 1, 8, 0, tzinfo=utc)
-    allocation.end = datetime(2014, 1, 1, 9, 0, tzinfo=utc)
-
-    assert allocation.limit_timespan(time(8, 0), time(9, 0)) == (
-        allocation.display_start(), allocation.display_end()
-    )
-
-    assert allocation.limit_timespan(time(7, 0), time(10, 0)) == (
-        allocation.display_start(), allocation.display_end()
-    )
-
-    assert allocation.limit_timespan(time(8, 30), time(10, 0)) == (
-        datetime(2014, 1, 1, 8, 30, tzinfo=utc),
-        datetime(2014, 1, 1, 9, 0, tzinfo=utc)
-    )
-
-    assert allocation.limit_timespan(time(8, 30), time(8, 40)) == (
-        datetime(2014, 1, 1, 8, 30, tzinfo=utc),
-        datetime(2014, 1, 1, 8, 45, tzinfo=utc)
-    )
-
-    assert allocation.limit_timespan(time(8, 30), time(0, 0)) == (
-        datetime(2014, 1, 1, 8, 30, tzinfo=utc),
-        datetime(2014, 1, 1, 9, 0, tzinfo=utc)
-    )
+# None stands for the whole (displayed) timespan of the allocation
+@pytest.mark.parametrize('start,end,start_time,end_time,expected', [
+    (T0800, T0900, time(8, 0), time(9, 0), None),
+    (T0800, T0900, time(7, 0), time(10, 0), None),
+    (T0800, T0900, time(8, 30), time(10, 0), (T0830, T0900)),
+    (T0800, T0900, time(8, 30), time(8, 40), (T0830, T0845)),
+    (T0800, T0900, time(8, 30), time(0, 0), (T0830, T0900)),
 
     # no problems should arise if whole-day allocations are used
-    allocation.start = datetime(2014, 1, 1, 0, 0, tzinfo=utc)
-    allocation.end = datetime(2014, 1, 2, 0, 0, tzinfo=utc)
-
-    assert allocation.whole_day
-
-    assert allocation.limit_timespan(time(0, 0), time(23, 59)) == (
-        allocation.display_start(), allocation.display_end()
-    )
+    (T0000, T2400, time(0, 0), time(23, 59), None),
+    (T0000, T2400, time(0, 0), time(0, 0), (T0000, T0000)),
+    (T0000, T2400, time(8, 30), time(10, 0), (T0830, T1000)),
+    (T0000, T2400, time(8, 30), time(8, 40), (T0830, T0845)),
+    (T0000, T2400, time(8, 30), time(0, 0), (T0830, T2400)),
+])
+def test_limit_timespan(
+    partly_available_allocation, start, end, start_time, end_time, expected
+):
+    allocation = partly_available_allocation
 
-    assert allocation.limit_timespan(time(0, 0), time(0, 0)) == (
-        datetime(2014, 1, 1, 0, 0, tzinfo=utc),
-        datetime(2014, 1, 1, 0, 0, tzinfo=utc)
-    )
+    # if partly available, more complex things happen
+    allocation.start = start
+    allocation.end = end
 
-    assert allocation.limit_timespan(time(8, 30), time(10, 0)) == (
-        datetime(2014, 1, 1, 8, 30, tzinfo=utc),
-        datetime(2014, 1, 1, 10, 0, tzinfo=utc)
-    )
+    assert allocation.whole_day == ((start, end) == (T0000, T2400))
 
-    assert allocation.limit_timespan(time(8, 30), time(8, 40)) == (
-        datetime(2014, 1, 1, 8, 30, tzinfo=utc),
-        datetime(2014, 1, 1, 8, 45, tzinfo=utc)
-    )
+    if expected is None:
+        expected = (allocation.display_start(), allocation.display_end())
 
-    assert allocation.limit_timespan(time(8, 30), time(0, 0)) == (
-        datetime(2014, 1, 1, 8, 30, tzinfo=utc),
-        datetime(2014, 1, 2, 0, 0, tzinfo=utc)
-    )
+    assert allocation.limit_timespan(start_time, end_time) == expected
 
 
 def add_reservation(scheduler, allocation, start, end):
@@ -243,7 +248,7 @@ def add_reservation(scheduler, allocation, start, end):
         slot.reservation_token = reservation
         scheduler.session.add(slot)
     scheduler.session.flush()
-    scheduler.session.refresh(allocation)
+    scheduler.session.expire(allocation, ['reserved_slots'])
 
 
 def test_availability_partitions(scheduler):
@@ -1,9 +1,11 @@
 import threading
 import pytest
-import random
 
+from concurrent.futures import ThreadPoolExecutor
 from libres.modules import errors
-from libres.context.registry import Registry
+from libres.context.registry import Registry, create_default_registry
+from libres.db.scheduler import Scheduler
+from uuid import uuid4 as new_uuid
 
 
 def test_registry_contexts():
@@ -36,6 +38,34 @@ def test_registry_contexts():
     assert r.current_context.name == 'bar'
 
 
+def test_context_switch_exception():
+    r = Registry()
+    r.register_context('foo')
+
+    with pytest.raises(RuntimeError):
+        with r.context('foo') as context:
+            assert context is r.current_context
+            assert context.name == 'foo'
+            raise RuntimeError
+
+    assert r.current_context is r.master_context
+
+
+def test_nested_context_switch():
+    r = Registry()
+    foo = r.register_context('foo')
+    bar = r.register_context('bar')
+
+    with r.context('foo'):
+        with r.context('bar'):
+            with r.context('foo'):
+                assert r.current_context is foo
+            assert r.current_context is bar
+        assert r.current_context is foo
+
+    assert r.current_context is r.master_context
+
+
 def test_autocreate():
     r = Registry()
 
@@ -83,6 +113,10 @@ def test_different_registries():
     r1.register_context('foo')
     r2.register_context('foo')
 
+    r1.register_context('bar')
+    assert not r2.is_existing_context('bar')
+    assert r1.get_context('foo') is not r2.get_context('foo')
+
 
 def test_locked_contexts():
     r = Registry()
@@ -139,41 +173,107 @@ def test_services_cache():
     assert first_call is second_call
 
 
-def test_threading_contexts():
+def test_services_cache_replaced():
+    r = Registry()
+
+    r.master_context.set_service(
+        'service', factory=lambda ctx: object(), cache=True
+    )
+
+    # caching an instance works on locked contexts as well
+    context = r.register_context('my_app')
+    context.lock()
+    first_call = context.get_service('service')
+    assert context.get_service('service') is first_call
+    context.unlock()
+
+    context.set_service('service', factory=lambda ctx: object(), cache=True)
+    second_call = context.get_service('service')
+
+    assert first_call is not second_call
+    assert context.get_service('service') is second_call
+
+    # without cache=True the caching is inherited from the master
+    context.set_service('service', factory=lambda ctx: object())
+    third_call = context.get_service('service')
+
+    assert third_call is not second_call
+    assert context.get_service('service') is third_call
+
+
+def test_services_cache_per_context():
     r = Registry()
 
-    class Application(threading.Thread):
+    r.master_context.set_service(
+        'service', factory=lambda ctx: ctx.name, cache=True
+    )
+
+    # the instance cached on the master is not shared with other contexts
+    assert r.master_context.get_service('service') == 'master'
+
+    one = r.register_context('one')
+    two = r.register_context('two')
+
+    assert one.get_service('service') == 'one'
+    assert two.get_service('service') == 'two'
+
+    # neither is it when a child context replaces the factory
+    r.master_context.set_service(
+        'other', factory=lambda ctx: object(), cache=True
+    )
+    master_call = r.master_context.get_service('other')
 
-        def __init__(self, name, registry):
-            threading.Thread.__init__(self)
-            self.registry = registry
-            self.name = name
+    one.set_service('other', factory=lambda ctx: object())
+    assert one.get_service('other') is not master_call
+    assert one.get_service('other') is one.get_service('other')
 
-        def run(self):
-            if self.registry.is_existing_context(self.name):
-                self.registry.get_context(self.name).switch_to()
-            else:
-                self.registry.register_context(self.name).switch_to()
 
-            self.result = self.registry.get_current_context().name
+def test_default_services_per_context():
+    r = create_default_registry()
 
-        def join(self):
-            threading.Thread.join(self)
-            return self.result
+    r.master_context.get_service('uuid_generator')
+    r.master_context.get_service('exposure')
+
+    one = r.register_context('one')
+    two = r.register_context('two')
+
+    assert one.get_service('uuid_generator')('rooms') \
+        != two.get_service('uuid_generator')('rooms')
+
+
+def test_uuid_namespace_change():
+    r = create_default_registry()
+    context = r.register_context('one')
+
+    scheduler = Scheduler(context, 'rooms', 'UTC')
+    resource = scheduler.resource
+    context.set_setting('uuid_namespace', new_uuid())
+
+    # new schedulers use the new namespace, existing ones once their
+    # cache is cleared
+    assert Scheduler(context, 'rooms', 'UTC').resource != resource
+
+    scheduler.clear_cache()
+    assert scheduler.resource != resource
+
+
+def test_threading_contexts():
+    r = Registry()
+    names = ['one', 'two', 'three', 'four']
 
-    for _ in range(0, 100):
+    # let all threads of a round enter the registry at the same time
+    barrier = threading.Barrier(len(names), timeout=10)
 
-        threads = [
-            Application('one', r),
-            Application('two', r),
-            Application('three', r),
-            Application('four', r)
-        ]
+    def run(name):
+        barrier.wait()
 
-        random.shuffle(threads)
+        if r.is_existing_context(name):
+            r.get_context(name).switch_to()
+        else:
+            r.register_context(name).switch_to()
 
-        for t in threads:
-            t.start()
+        return r.get_current_context().name
 
-        results = [t.join() for t in threads]
-        assert sorted(results) == sorted(['one', 'two', 'three', 'four'])
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        for _ in range(0, 100):
+            assert list(executor.map(run, names)) == names
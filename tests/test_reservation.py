@@ -3,6 +3,7 @@ import pytest
 from datetime import datetime, timedelta
 from libres.db.models import Reservation
 from libres.modules.errors import OverlappingReservationError
+from pytz import timezone
 from sedate import standardize_date
 from uuid import uuid4
 
@@ -48,13 +49,13 @@ def test_group_reservation_timespans(scheduler):
     timespans = reservation.timespans()
     assert len(timespans) == 2
 
-    assert timespans[0].start == standardize_date(dates[0][0], 'Europe/Zurich')
-    assert timespans[0].end == standardize_date(dates[0][1], 'Europe/Zurich')\
-        - timedelta(microseconds=1)
-
-    assert timespans[1].start == standardize_date(dates[1][0], 'Europe/Zurich')
-    assert timespans[1].end == standardize_date(dates[1][1], 'Europe/Zurich')\
-        - timedelta(microseconds=1)
+    zurich = timezone('Europe/Zurich')
+    assert [(t.start, t.end) for t in timespans] == [
+        (
+            standardize_date(start, zurich),
+            standardize_date(end, zurich) - timedelta(microseconds=1)
+        ) for start, end in dates
+    ]
 
 
 def test_overlapping_reservations(scheduler):
@@ -30,9 +30,7 @@ def test_add_reserved_slot(scheduler):
     another.allocation = allocation
     another.reservation_token = reservation
 
-    scheduler.session.add(allocation)
-    scheduler.session.add(slot)
-    scheduler.session.add(another)
+    scheduler.session.add_all((allocation, slot, another))
 
     with pytest.raises(IntegrityError):
         scheduler.session.flush()
@@ -12,6 +12,24 @@ from sqlalchemy.orm.exc import MultipleResultsFound
 from uuid import uuid4 as new_uuid
 
 
+# the (naive) datetimes most of the reservation change tests use on 2014-08-07
+T0800 = datetime(2014, 8, 7, 8, 0)
+T0900 = datetime(2014, 8, 7, 9, 0)
+T1000 = datetime(2014, 8, 7, 10, 0)
+
+# the (naive) datetimes shared by the allocation tests on 2015-02-09
+FEB09_1000 = datetime(2015, 2, 9, 10, 0)
+FEB09_1100 = datetime(2015, 2, 9, 11, 0)
+FEB09_1200 = datetime(2015, 2, 9, 12, 0)
+FEB09_1300 = datetime(2015, 2, 9, 13, 0)
+
+# the (naive) datetimes shared by the reservation tests on 2011-01-01
+JAN01_1500 = datetime(2011, 1, 1, 15, 0)
+JAN01_1530 = datetime(2011, 1, 1, 15, 30)
+JAN01_1600 = datetime(2011, 1, 1, 16, 0)
+JAN01_1700 = datetime(2011, 1, 1, 17, 0)
+
+
 def test_rollback(scheduler):
 
     # write something in the transaction
@@ -43,7 +61,7 @@ def test_manual_approval_required(scheduler):
 
 def test_allocations_to_whole_day(scheduler):
 
-    dates = (datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 11))
+    dates = (FEB09_1000, FEB09_1100)
     allocations = scheduler.allocate(dates)
     scheduler.commit()
 
@@ -62,8 +80,8 @@ def test_allocations_to_whole_day(scheduler):
 
 def test_move_allocation_over_existing(scheduler):
     dates = [
-        (datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 11)),
-        (datetime(2015, 2, 9, 11), datetime(2015, 2, 9, 12)),
+        (FEB09_1000, FEB09_1100),
+        (FEB09_1100, FEB09_1200),
     ]
 
     allocations = scheduler.allocate(dates)
@@ -72,13 +90,13 @@ def test_move_allocation_over_existing(scheduler):
     with pytest.raises(errors.OverlappingAllocationError):
         scheduler.move_allocation(
             allocations[0].id,
-            new_start=datetime(2015, 2, 9, 10),
-            new_end=datetime(2015, 2, 9, 12)
+            new_start=FEB09_1000,
+            new_end=FEB09_1200
         )
 
 
 def test_move_allocation_with_existing_reservation(scheduler):
-    dates = [(datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 11))]
+    dates = [(FEB09_1000, FEB09_1100)]
 
     allocations = scheduler.allocate(dates)
     token = scheduler.reserve('test@example.org', dates)
@@ -86,26 +104,28 @@ def test_move_allocation_with_existing_reservation(scheduler):
 
     # This allocation is not partly available, so any change is prohibited
     # if a pending reservation exists.
-    with pytest.raises(errors.AffectedPendingReservationError):
+    with pytest.raises(errors.AffectedPendingReservationError) as e:
         scheduler.move_allocation(
             allocations[0].id,
-            new_start=datetime(2015, 2, 9, 10),
-            new_end=datetime(2015, 2, 9, 12)
+            new_start=FEB09_1000,
+            new_end=FEB09_1200
         )
 
+    assert e.value.existing.token == token
+
     scheduler.approve_reservations(token)
     scheduler.commit()
 
     with pytest.raises(errors.AffectedReservationError):
         scheduler.move_allocation(
             allocations[0].id,
-            new_start=datetime(2015, 2, 9, 10),
-            new_end=datetime(2015, 2, 9, 12)
+            new_start=FEB09_1000,
+            new_end=FEB09_1200
         )
 
 
 def test_move_partly_available_allocation_with_existing_reservation(scheduler):
-    dates = [(datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 12))]
+    dates = [(FEB09_1000, FEB09_1200)]
 
     allocations = scheduler.allocate(dates, partly_available=True)
     scheduler.reserve('test@example.org', dates)
@@ -116,21 +136,21 @@ def test_move_partly_available_allocation_with_existing_reservation(scheduler):
     with pytest.raises(errors.AffectedPendingReservationError):
         scheduler.move_allocation(
             allocations[0].id,
-            new_start=datetime(2015, 2, 9, 10),
-            new_end=datetime(2015, 2, 9, 11)
+            new_start=FEB09_1000,
+            new_end=FEB09_1100
         )
 
     # .. but the allocations may be grown
     scheduler.move_allocation(
         allocations[0].id,
-        new_start=datetime(2015, 2, 9, 10),
-        new_end=datetime(2015, 2, 9, 13)
+        new_start=FEB09_1000,
+        new_end=FEB09_1300
     )
     scheduler.commit()
 
 
 def test_change_allocation_data(scheduler):
-    dates = [(datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 12))]
+    dates = [(FEB09_1000, FEB09_1200)]
 
     allocation = scheduler.allocate(dates, data={'foo': 'bar'})[0]
     scheduler.commit()
@@ -148,7 +168,7 @@ def test_change_allocation_data(scheduler):
 
 def test_change_reservation_data(scheduler):
 
-    dates = [(datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 12))]
+    dates = [(FEB09_1000, FEB09_1200)]
 
     allocation = scheduler.allocate(dates)[0]
     token = scheduler.reserve(
@@ -165,7 +185,7 @@ def test_change_reservation_data(scheduler):
 
 
 def test_reserve_quota(scheduler):
-    dates = [(datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 12))]
+    dates = [(FEB09_1000, FEB09_1200)]
 
     scheduler.allocate(dates, quota=2, quota_limit=1)
     scheduler.commit()
@@ -182,7 +202,7 @@ def test_reserve_quota(scheduler):
 
 def test_reserve_impossible_quota(scheduler):
 
-    dates = [(datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 12))]
+    dates = [(FEB09_1000, FEB09_1200)]
 
     scheduler.allocate(dates, quota=2, approve_manually=True)
     scheduler.commit()
@@ -193,21 +213,23 @@ def test_reserve_impossible_quota(scheduler):
 
 def test_remove_allocation_with_pending_reservation(scheduler):
     dates = [
-        (datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 12)),
+        (FEB09_1000, FEB09_1200),
         (datetime(2015, 2, 10, 10), datetime(2015, 2, 10, 12)),
     ]
 
     id = scheduler.allocate(dates, grouped=True, approve_manually=True)[0].id
-    scheduler.reserve(email='test@example.org', dates=dates)
+    token = scheduler.reserve(email='test@example.org', dates=dates)
     scheduler.commit()
 
-    with pytest.raises(errors.AffectedPendingReservationError):
+    with pytest.raises(errors.AffectedPendingReservationError) as e:
         scheduler.remove_allocation(id)
 
+    assert e.value.existing.token == token
+
 
 def test_remove_grouped_allocation(scheduler):
     dates = [
-        (datetime(2015, 2, 9, 10), datetime(2015, 2, 9, 12)),
+        (FEB09_1000, FEB09_1200),
         (datetime(2015, 2, 10, 10), datetime(2015, 2, 10, 12)),
     ]
 
@@ -259,7 +281,7 @@ def test_reservation_too_short(scheduler):
 
     with pytest.raises(errors.ReservationTooShort):
         scheduler.reserve(email='test@example.org', dates=[
-            (datetime(2015, 2, 9, 10, 0), datetime(2015, 2, 9, 10, 1)),
+            (FEB09_1000, datetime(2015, 2, 9, 10, 1)),
         ])
 
 
@@ -289,15 +311,11 @@ def test_managed_allocations(scheduler):
     assert scheduler.managed_allocations().count() == 1
     assert s2.managed_allocations().count() == 1
 
-    # be sure to clean up afterwards as this won't be done automatically
-    s2.extinguish_managed_records()
-    s2.commit()
-
 
 def test_reserve(scheduler):
 
-    start = datetime(2011, 1, 1, 15)
-    end = datetime(2011, 1, 1, 16)
+    start = JAN01_1500
+    end = JAN01_1600
 
     # create an allocation (no need for a commit yet, we won't hit the db again
     # until we check the remaining slots below)
@@ -313,7 +331,7 @@ def test_reserve(scheduler):
     assert len(possible_dates) == 4
 
     # reserve half of the slots
-    time = (datetime(2011, 1, 1, 15), datetime(2011, 1, 1, 15, 30))
+    time = (JAN01_1500, JAN01_1530)
     token = scheduler.reserve('test@example.org', time)
     slots = scheduler.approve_reservations(token)
 
@@ -330,18 +348,18 @@ def test_reserve(scheduler):
 
     reserved_slots = scheduler.reserved_slots_by_reservation(token).all()
 
-    def by_start(s):
-        return s.start
+    def key(s):
+        return s.start, s.end, s.reservation_token
 
-    assert list(sorted(slots, key=by_start)) \
-        == list(sorted(reserved_slots, key=by_start))
+    assert len(slots) == len(reserved_slots)
+    assert set(map(key, slots)) == set(map(key, reserved_slots))
 
     # try to illegally move the slot
     with pytest.raises(errors.AffectedReservationError):
         scheduler.move_allocation(
             master_id=allocation.id,
-            new_start=datetime(2011, 1, 1, 15, 30),
-            new_end=datetime(2011, 1, 1, 16),
+            new_start=JAN01_1530,
+            new_end=JAN01_1600,
         )
 
     assert len(allocation.free_slots()) == 2
@@ -349,8 +367,8 @@ def test_reserve(scheduler):
     # actually move the slot
     scheduler.move_allocation(
         master_id=allocation.id,
-        new_start=datetime(2011, 1, 1, 15),
-        new_end=datetime(2011, 1, 1, 15, 30)
+        new_start=JAN01_1500,
+        new_end=JAN01_1530
     )
 
     # there should be fewer slots now
@@ -358,7 +376,7 @@ def test_reserve(scheduler):
 
     # remove the reservation
     scheduler.remove_reservation(token)
-    scheduler.session.refresh(allocation)
+    scheduler.session.expire(allocation, ['reserved_slots'])
     assert len(allocation.free_slots()) == 2
 
 
@@ -368,7 +386,7 @@ def test_reserve_single_token_per_session(scheduler):
 
     a1, a2 = scheduler.allocate(
         dates=(
-            datetime(2011, 1, 1, 15), datetime(2011, 1, 1, 16),
+            JAN01_1500, JAN01_1600,
             datetime(2011, 1, 2, 15), datetime(2011, 1, 2, 16)
         ),
         quota=1
@@ -421,39 +439,52 @@ def test_change_email(scheduler):
     token = scheduler.reserve('original@example.org', dates)
     scheduler.commit()
 
-    assert [r.email for r in scheduler.reservations_by_token(token)]\
-        == ['original@example.org'] * 2
+    def emails():
+        query = scheduler.reservations_by_token(token)
+        return [email for email, in query.with_entities(Reservation.email)]
+
+    assert emails() == ['original@example.org'] * 2
 
     # change the email and ensure that all reservation records are changed
     scheduler.change_email(token, 'newmail@example.org')
     scheduler.commit()
 
-    assert [r.email for r in scheduler.reservations_by_token(token)]\
-        == ['newmail@example.org'] * 2
+    assert emails() == ['newmail@example.org'] * 2
 
     # approve the reservation and change again
     scheduler.approve_reservations(token)
     scheduler.change_email(token, 'another@example.org')
     scheduler.commit()
 
-    assert [r.email for r in scheduler.reservations_by_token(token)]\
-        == ['another@example.org'] * 2
+    assert emails() == ['another@example.org'] * 2
 
 
-def test_change_reservation_assertions(scheduler):
+@pytest.fixture(scope="function")
+def reservation_changed(scheduler):
     reservation_changed = Mock()
     events.on_reservation_time_changed.append(reservation_changed)
 
-    dates = (datetime(2014, 8, 7, 8, 0), datetime(2014, 8, 7, 17, 0))
+    yield reservation_changed
+
+    events.on_reservation_time_changed.remove(reservation_changed)
+
+
+def test_change_reservation_not_partly_available(
+    scheduler, reservation_changed
+):
+    dates = (T0800, datetime(2014, 8, 7, 17, 0))
 
     scheduler.allocate(dates, partly_available=False)
     token = scheduler.reserve('original@example.org', dates)
-    scheduler.commit()
-
-    reservation = scheduler.reservations_by_token(token).one()
     scheduler.approve_reservations(token)
     scheduler.commit()
 
+    # only reservations of partly available allocations may be changed
+    assert scheduler.change_reservation_time_candidates().count() == 0
+    assert not reservation_changed.called
+
+
+def test_change_reservation_grouped(scheduler, reservation_changed):
     dates = (
         (datetime(2014, 8, 10, 11, 0), datetime(2014, 8, 10, 12, 0)),
         (datetime(2014, 8, 11, 11, 0), datetime(2014, 8, 11, 12, 0))
@@ -461,7 +492,6 @@ def test_change_reservation_assertions(scheduler):
 
     scheduler.allocate(dates, grouped=True)
     token = scheduler.reserve('original@example.org', dates)
-    scheduler.commit()
 
     reservation = scheduler.reservations_by_token(token).one()
     scheduler.approve_reservations(token)
@@ -475,12 +505,14 @@ def test_change_reservation_assertions(scheduler):
     assert scheduler.change_reservation_time_candidates().count() == 0
     assert not reservation_changed.called
 
-    # fail if the dates are outside the allocation
+
+def test_change_reservation_outside_allocation(
+    scheduler, reservation_changed
+):
     dates = (datetime(2014, 3, 7, 8, 0), datetime(2014, 3, 7, 17, 0))
 
     scheduler.allocate(dates, partly_available=True)
     token = scheduler.reserve('original@example.org', dates)
-    scheduler.commit()
 
     reservation = scheduler.reservations_by_token(token).one()
     scheduler.approve_reservations(token)
@@ -502,9 +534,11 @@ def test_change_reservation_assertions(scheduler):
             datetime(2014, 3, 7, 8, 0), datetime(2014, 3, 7, 17, 1)
         )
 
+    assert not reservation_changed.called
+
 
 def test_change_unapproved_reservation_quota(scheduler):
-    dates = (datetime(2014, 8, 7, 8, 0), datetime(2014, 8, 7, 10, 0))
+    dates = (T0800, T1000)
     scheduler.allocate(dates, quota=2)
 
     token = scheduler.reserve(
@@ -535,11 +569,8 @@ def test_change_unapproved_reservation_quota(scheduler):
     assert new.session_id and new.session_id == reservation.session_id
 
 
-def test_change_reservation(scheduler):
-    reservation_changed = Mock()
-    events.on_reservation_time_changed.append(reservation_changed)
-
-    dates = (datetime(2014, 8, 7, 8, 0), datetime(2014, 8, 7, 10, 0))
+def test_change_reservation(scheduler, reservation_changed):
+    dates = (T0800, T1000)
 
     scheduler.allocate(dates, partly_available=True)
 
@@ -547,11 +578,9 @@ def test_change_reservation(scheduler):
         'foo': 'bar'
     }
     token = scheduler.reserve('original@example.org', (
-        datetime(2014, 8, 7, 8, 0), datetime(2014, 8, 7, 9)
+        T0800, T0900
     ), data=data)
 
-    scheduler.commit()
-
     reservation = scheduler.reservations_by_token(token).one()
     original_id = reservation.id
 
@@ -563,14 +592,14 @@ def test_change_reservation(scheduler):
     # make sure that no changes are made in these cases
     assert not scheduler.change_reservation(
         token, reservation.id,
-        datetime(2014, 8, 7, 8, 0),
-        datetime(2014, 8, 7, 9)
+        T0800,
+        T0900
     )
 
     assert not scheduler.change_reservation(
         token, reservation.id,
-        datetime(2014, 8, 7, 8, 0),
-        datetime(2014, 8, 7, 9) - timedelta(microseconds=1)
+        T0800,
+        T0900 - timedelta(microseconds=1)
     )
 
     assert not reservation_changed.called
@@ -578,26 +607,24 @@ def test_change_reservation(scheduler):
     # make sure the change is propagated
     scheduler.change_reservation(
         token, reservation.id,
-        datetime(2014, 8, 7, 8, 0),
-        datetime(2014, 8, 7, 10)
+        T0800,
+        T1000
     )
     scheduler.commit()
 
     assert reservation_changed.called
-    assert reservation_changed.call_args[0][0].name == scheduler.context.name
-    assert reservation_changed.call_args[1]['old_time'][0].hour == 8
-    assert reservation_changed.call_args[1]['old_time'][1].hour == 9
-    assert reservation_changed.call_args[1]['new_time'][0].hour == 8
-    assert reservation_changed.call_args[1]['new_time'][1].hour == 10
+
+    args, kwargs = reservation_changed.call_args
+    assert args[0].name == scheduler.context.name
+    assert [d.hour for d in kwargs['old_time']] == [8, 9]
+    assert [d.hour for d in kwargs['new_time']] == [8, 10]
 
     reservation = scheduler.reservations_by_token(token).one()
 
-    assert reservation.start == sedate.standardize_date(
-        datetime(2014, 8, 7, 8, 0), scheduler.timezone
-    )
+    timezone = sedate.ensure_timezone(scheduler.timezone)
+    assert reservation.start == sedate.standardize_date(T0800, timezone)
     assert reservation.end == sedate.standardize_date(
-        datetime(2014, 8, 7, 10, 0) - timedelta(microseconds=1),
-        scheduler.timezone
+        T1000 - timedelta(microseconds=1), timezone
     )
 
     # the data must stay the same
@@ -608,27 +635,27 @@ def test_change_reservation(scheduler):
 
     scheduler.change_reservation(
         token, reservation.id,
-        datetime(2014, 8, 7, 9, 0),
-        datetime(2014, 8, 7, 10, 0)
+        T0900,
+        T1000
     )
 
     scheduler.approve_reservations(
         scheduler.reserve('original@example.org', (
-            datetime(2014, 8, 7, 8, 0), datetime(2014, 8, 7, 9)
+            T0800, T0900
         ))
     )
 
     with pytest.raises(errors.AlreadyReservedError):
         scheduler.change_reservation(
             token, reservation.id,
-            datetime(2014, 8, 7, 8, 0),
-            datetime(2014, 8, 7, 10, 0)
+            T0800,
+            T1000
         )
 
 
 def test_change_reservation_quota(scheduler):
     dates = (
-        datetime(2014, 8, 7, 8, 0), datetime(2014, 8, 7, 10, 0)
+        T0800, T1000
     )
 
     scheduler.allocate(dates, partly_available=True, quota=2)
@@ -637,16 +664,15 @@ def test_change_reservation_quota(scheduler):
     # two others occupying one half each (1 + .5 +.5 = 2 (quota))
     tokens = [
         scheduler.reserve('original@example.org', (
-            datetime(2014, 8, 7, 8, 0), datetime(2014, 8, 7, 10, 0)
+            T0800, T1000
         )),
         scheduler.reserve('original@example.org', (
-            datetime(2014, 8, 7, 8, 0), datetime(2014, 8, 7, 9, 0)
+            T0800, T0900
         )),
         scheduler.reserve('original@example.org', (
-            datetime(2014, 8, 7, 9, 0), datetime(2014, 8, 7, 10, 0)
+            T0900, T1000
         ))
     ]
-    scheduler.commit()
 
     assert scheduler.change_reservation_time_candidates().count() == 0
 
@@ -662,8 +688,8 @@ def test_change_reservation_quota(scheduler):
     with pytest.raises(errors.AlreadyReservedError):
         scheduler.change_reservation(
             tokens[2], reservation.id,
-            datetime(2014, 8, 7, 8, 0),
-            datetime(2014, 8, 7, 10, 0)
+            T0800,
+            T1000
         )
 
     # ensure that the failed removal didn't affect the reservations
@@ -676,15 +702,15 @@ def test_change_reservation_quota(scheduler):
 
     assert scheduler.change_reservation(
         tokens[2], reservation.id,
-        datetime(2014, 8, 7, 8, 0),
-        datetime(2014, 8, 7, 10, 0)
+        T0800,
+        T1000
     )
 
     reservation = scheduler.reservations_by_token(tokens[1]).one()
     assert scheduler.change_reservation(
         tokens[1], reservation.id,
-        datetime(2014, 8, 7, 8, 0),
-        datetime(2014, 8, 7, 10, 0)
+        T0800,
+        T1000
     )
 
 
@@ -705,7 +731,6 @@ def test_group_reserve(scheduler):
     # reserve the same thing three times, which should yield equal results
     def reserve():
         token = scheduler.reserve('test@example.com', group=group)
-        scheduler.commit()
 
         reservation = scheduler.reservations_by_token(token).one()
 
@@ -739,7 +764,9 @@ def test_session_expiration(scheduler):
 
     res = scheduler.session.query(Reservation)
     res = res.filter(Reservation.session_id == session_id)
-    res.update({'created': created, 'modified': None})
+    res.update(
+        {'created': created, 'modified': None}, synchronize_session=False
+    )
 
     scheduler.commit()
 
@@ -758,7 +785,7 @@ def test_session_expiration(scheduler):
     res.update({
         'created': created,
         'modified': created + timedelta(microseconds=1)
-    })
+    }, synchronize_session=False)
 
     scheduler.commit()
 
@@ -809,6 +836,10 @@ def test_invalid_reservation(scheduler):
         scheduler.reserve('test@example.org', rdates)
 
 
+def test_reservations_by_unknown_token(scheduler):
+    assert scheduler.reservations_by_token(new_uuid()).all() == []
+
+
 def test_waitinglist(scheduler):
     start = datetime(2012, 2, 29, 15, 0)
     end = datetime(2012, 2, 29, 19, 0)
@@ -820,7 +851,6 @@ def test_waitinglist(scheduler):
 
     # reservation should work
     approval_token = scheduler.reserve('test@example.org', dates)
-    scheduler.commit()
 
     reservation = scheduler.reservations_by_token(approval_token).one()
 
@@ -867,8 +897,8 @@ def test_no_bleed(scheduler):
     the name.
 
     """
-    d1 = (datetime(2011, 1, 1, 15, 0), datetime(2011, 1, 1, 16, 0))
-    d2 = (datetime(2011, 1, 1, 16, 0), datetime(2011, 1, 1, 17, 0))
+    d1 = (JAN01_1500, JAN01_1600)
+    d2 = (JAN01_1600, JAN01_1700)
 
     a1 = scheduler.allocate(d1)[0]
     a2 = scheduler.allocate(d2)[0]
@@ -886,17 +916,10 @@ def test_no_bleed(scheduler):
 def test_waitinglist_group(scheduler):
     from dateutil.rrule import rrule, DAILY, MO
 
-    days = list(rrule(
+    mondays = rrule(
         DAILY, count=5, byweekday=(MO,), dtstart=datetime(2012, 1, 1)
-    ))
-    dates = []
-    for d in days:
-        dates.append(
-            (
-                datetime(d.year, d.month, d.day, 15, 0),
-                datetime(d.year, d.month, d.day, 16, 0)
-            )
-        )
+    )
+    dates = [(d.replace(hour=15), d.replace(hour=16)) for d in mondays]
 
     allocations = scheduler.allocate(
         dates, grouped=True, approve_manually=True
@@ -993,7 +1016,7 @@ def test_group_move(scheduler):
 
     group_allocations = scheduler.allocations_by_group(
         allocations[0].group).all()
-    all = list(utils.flatten([a.siblings() for a in group_allocations]))
+    all = utils.flatten([a.siblings() for a in group_allocations])
     assert scheduler.queries.availability_by_allocations(all) == 0.0
 
     scheduler.move_allocation(allocations[0].id, newstart, newend, new_quota=2)
@@ -1093,7 +1116,7 @@ def test_userlimits(scheduler):
     # that we have to look at how to stop the user from reserving one year
     # with a single form.
 
-    start = datetime(2011, 1, 1, 15, 0)
+    start = JAN01_1500
     end = start + timedelta(days=1)
 
     with pytest.raises(errors.ReservationTooLong):
@@ -1106,8 +1129,8 @@ def test_allocation_overlap(scheduler):
     sc2 = scheduler.clone()
     sc2.name = 'clone'
 
-    start = datetime(2011, 1, 1, 15, 0)
-    end = datetime(2011, 1, 1, 16, 0)
+    start = JAN01_1500
+    end = JAN01_1600
 
     sc1.allocate((start, end), raster=15)
     sc1.commit()
@@ -1145,6 +1168,17 @@ def test_allocation_overlap(scheduler):
         (datetime(2013, 1, 1, 13, 0), datetime(2013, 1, 1, 14, 0))
     ]
 
+    with pytest.raises(errors.InvalidAllocationError):
+        sc3.allocate(dates)
+
+    # the order of the dates does not matter
+    dates = [
+        (datetime(2013, 1, 1, 15, 0), datetime(2013, 1, 1, 16, 0)),
+        (datetime(2013, 1, 1, 12, 0), datetime(2013, 1, 1, 14, 0)),
+        (datetime(2013, 1, 1, 9, 0), datetime(2013, 1, 1, 10, 0)),
+        (datetime(2013, 1, 1, 13, 0), datetime(2013, 1, 1, 13, 30))
+    ]
+
     with pytest.raises(errors.InvalidAllocationError):
         sc3.allocate(dates)
 
@@ -1158,12 +1192,45 @@ def test_allocation_overlap(scheduler):
 
     assert allocations[0]._end < allocations[1]._start
 
-    # only sc1 is cleaned up automatically
-    sc2.extinguish_managed_records()
-    sc2.commit()
 
-    sc3.extinguish_managed_records()
-    sc3.commit()
+def test_allocation_skip_overlapping(scheduler):
+    scheduler.allocate((JAN01_1500, JAN01_1600), raster=15)
+    scheduler.commit()
+
+    dates = [
+        (JAN01_1600, JAN01_1700),
+        (datetime(2011, 1, 1, 14, 30), JAN01_1530),
+        (datetime(2011, 1, 1, 12, 0), datetime(2011, 1, 1, 13, 0)),
+        (JAN01_1530, datetime(2011, 1, 1, 15, 45)),
+    ]
+
+    allocations = scheduler.allocate(
+        dates, raster=15, skip_overlapping=True
+    )
+
+    assert [a.start for a in allocations] == [
+        sedate.standardize_date(JAN01_1600, scheduler.timezone),
+        sedate.standardize_date(
+            datetime(2011, 1, 1, 12, 0), scheduler.timezone
+        )
+    ]
+
+
+def test_allocation_overlap_reported_range(scheduler):
+    scheduler.allocate((JAN01_1500, JAN01_1600), raster=15)
+    scheduler.commit()
+
+    # the error points at the first overlapping range as passed in
+    with pytest.raises(errors.OverlappingAllocationError) as e:
+        scheduler.allocate([
+            (datetime(2011, 1, 1, 12, 0), datetime(2011, 1, 1, 13, 0)),
+            (JAN01_1530, JAN01_1600),
+            (JAN01_1500, datetime(2011, 1, 1, 15, 15)),
+        ], raster=15)
+
+    assert e.value.start == sedate.standardize_date(
+        JAN01_1530, scheduler.timezone
+    )
 
 
 def test_allocation_partition(scheduler):
@@ -1223,7 +1290,7 @@ def test_partly(scheduler):
 
     token = scheduler.reserve(
         'info@example.org',
-        (datetime(2011, 1, 1, 16, 0), datetime(2011, 1, 1, 18, 0))
+        (JAN01_1600, datetime(2011, 1, 1, 18, 0))
     )
     scheduler.approve_reservations(token)
 
@@ -1281,8 +1348,8 @@ def test_allocation_dates_by_ids(scheduler):
 
 
 def test_quotas(scheduler):
-    start = datetime(2011, 1, 1, 15, 0)
-    end = datetime(2011, 1, 1, 16, 0)
+    start = JAN01_1500
+    end = JAN01_1600
 
     # setup an allocation with ten spots
     allocations = scheduler.allocate(
@@ -1324,13 +1391,13 @@ def test_quotas(scheduler):
         other.approve_reservations(
             other.reserve(
                 'test@example.org',
-                (datetime(2011, 1, 1, 15, 0), datetime(2011, 1, 1, 15, 30))
+                (JAN01_1500, JAN01_1530)
             )
         )
         other.approve_reservations(
             other.reserve(
                 'test@example.org',
-                (datetime(2011, 1, 1, 15, 30), datetime(2011, 1, 1, 16, 0))
+                (JAN01_1530, JAN01_1600)
             )
         )
 
@@ -1338,7 +1405,7 @@ def test_quotas(scheduler):
 
     with pytest.raises(errors.AlreadyReservedError):
         other.reserve('test@example.org', (
-            (datetime(2011, 1, 1, 15, 30), datetime(2011, 1, 1, 16, 0))
+            (JAN01_1530, JAN01_1600)
         ))
 
     # test some queries
@@ -1356,13 +1423,10 @@ def test_quotas(scheduler):
     other.allocation_by_id(allocation.id)
     assert len(other.allocation_mirrors_by_master(allocation)) == 4
 
-    other.extinguish_managed_records()
-    other.commit()
-
 
 def test_fragmentation(scheduler):
-    start = datetime(2011, 1, 1, 15, 0)
-    end = datetime(2011, 1, 1, 16, 0)
+    start = JAN01_1500
+    end = JAN01_1600
     daterange = (start, end)
 
     allocation = scheduler.allocate(daterange, quota=3)[0]
@@ -1388,8 +1452,8 @@ def test_fragmentation(scheduler):
 
 
 def test_imaginary_mirrors(scheduler):
-    start = datetime(2011, 1, 1, 15, 0)
-    end = datetime(2011, 1, 1, 16, 0)
+    start = JAN01_1500
+    end = JAN01_1600
     daterange = (start, end)
 
     allocation = scheduler.allocate(daterange, quota=3)[0]
@@ -1484,8 +1548,8 @@ def test_allocations_by_multiple_reservations(scheduler):
 
 
 def test_quota_changes_simple(scheduler):
-    start = datetime(2011, 1, 1, 15, 0)
-    end = datetime(2011, 1, 1, 16, 0)
+    start = JAN01_1500
+    end = JAN01_1600
     daterange = (start, end)
     master = scheduler.allocate(daterange, quota=5)[0]
     assert master.quota_left == 5
@@ -1546,8 +1610,8 @@ def test_quota_changes_advanced(scheduler):
     # -> 1, 2, -, -, 5, -, 7
     # => 1, 2, 3, 4, -, - ,-
 
-    start = datetime(2011, 1, 1, 15, 0)
-    end = datetime(2011, 1, 1, 16, 0)
+    start = JAN01_1500
+    end = JAN01_1600
     daterange = (start, end)
 
     master = scheduler.allocate(daterange, quota=7)[0]
@@ -1603,8 +1667,8 @@ def test_quota_changes_advanced(scheduler):
 
 
 def test_availability(scheduler):
-    start = datetime(2011, 1, 1, 15, 0)
-    end = datetime(2011, 1, 1, 16, 0)
+    start = JAN01_1500
+    end = JAN01_1600
 
     a = scheduler.allocate(
         (start, end), raster=15, partly_available=True)[0]
@@ -1612,7 +1676,7 @@ def test_availability(scheduler):
     scheduler.approve_reservations(
         scheduler.reserve(
             'test@example.org',
-            (datetime(2011, 1, 1, 15, 0), datetime(2011, 1, 1, 15, 15))
+            (JAN01_1500, datetime(2011, 1, 1, 15, 15))
         )
     )
     scheduler.commit()
@@ -1623,7 +1687,7 @@ def test_availability(scheduler):
     scheduler.approve_reservations(
         scheduler.reserve(
             'test@example.org',
-            (datetime(2011, 1, 1, 15, 45), datetime(2011, 1, 1, 16, 0))
+            (datetime(2011, 1, 1, 15, 45), JAN01_1600)
         )
     )
     scheduler.commit()
@@ -1634,7 +1698,7 @@ def test_availability(scheduler):
     scheduler.approve_reservations(
         scheduler.reserve(
             'test@example.org',
-            (datetime(2011, 1, 1, 15, 15), datetime(2011, 1, 1, 15, 30))
+            (datetime(2011, 1, 1, 15, 15), JAN01_1530)
         )
     )
     scheduler.commit()
@@ -1645,7 +1709,7 @@ def test_availability(scheduler):
     scheduler.approve_reservations(
         scheduler.reserve(
             'test@example.org',
-            (datetime(2011, 1, 1, 15, 30), datetime(2011, 1, 1, 15, 45))
+            (JAN01_1530, datetime(2011, 1, 1, 15, 45))
         )
     )
     scheduler.commit()
@@ -1683,9 +1747,6 @@ def test_availability(scheduler):
     sc2.commit()
     assert sc2.availability() == 0.0
 
-    sc2.extinguish_managed_records()
-    sc2.commit()
-
 
 def test_events(scheduler):
 
@@ -2037,9 +2098,6 @@ def test_availability_by_day(scheduler):
     days = scheduler.queries.availability_by_day(*dates, resources=resources)
     assert days[dates[0].date()][0] == 0.00
 
-    sc2.extinguish_managed_records()
-    sc2.commit()
-
 
 def test_remove_unused_allocations(scheduler):
 
@@ -1,12 +1,16 @@
 import libres
 import time
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from libres.context.session import SessionProvider
 from libres.db.models import Allocation
 from libres.db.scheduler import Scheduler
 from psycopg2.extensions import TransactionRollbackError
-from threading import Thread
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from threading import Barrier, Thread
+from unittest.mock import patch
 from uuid import uuid4 as new_uuid
 
 
@@ -52,6 +56,65 @@ def test_stop_unused_session(dsn):
     provider.stop_service()  # should not throw any exceptions
 
 
+def test_lazy_engine(dsn):
+    with patch(
+        'libres.context.session.create_engine', wraps=create_engine
+    ) as create:
+        provider = SessionProvider(dsn)
+        assert not create.called
+
+        provider.session().close()
+        assert create.called
+
+    provider.stop_service()
+
+
+def test_engine_created_once(dsn):
+    # let all threads ask for the engine at the same time
+    barrier = Barrier(4, timeout=10)
+
+    def engine(_):
+        barrier.wait()
+        return provider.engine
+
+    with patch(
+        'libres.context.session.create_engine', wraps=create_engine
+    ) as create:
+        provider = SessionProvider(dsn)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            engines = set(executor.map(engine, range(4)))
+
+        # one engine for the postgres version check, one for the provider
+        assert create.call_count == 2
+
+    assert engines == {provider.engine}
+    provider.stop_service()
+
+
+def test_engine_config(dsn):
+    provider = SessionProvider(dsn, engine_config={'poolclass': NullPool})
+    assert provider.session().execute('SELECT 1').scalar() == 1
+    assert isinstance(provider.engine.pool, NullPool)
+    provider.stop_service()
+
+    provider = SessionProvider(dsn, engine_config={'pool_size': 1})
+    assert provider.session().execute('SELECT 1').scalar() == 1
+    assert provider.engine.pool.size() == 1
+    provider.stop_service()
+
+
+def test_remove_session(dsn):
+    provider = SessionProvider(dsn)
+    session = provider.session()
+    assert provider.session() is session
+
+    provider.remove_session()
+    assert provider.session() is not session
+
+    provider.stop_service()
+
+
 def test_sessionstore(dsn):
     t1 = SessionId(dsn)
     t2 = SessionId(dsn)
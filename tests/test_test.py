@@ -5,11 +5,10 @@ from libres.db.models import Allocation
 
 
 @pytest.mark.parametrize('execution_number', range(2))
-@pytest.mark.parametrize('scheduler_context', ['test'])
-@pytest.mark.parametrize('scheduler_name', ['test'])
-def test_independence(
-    scheduler, execution_number, scheduler_context, scheduler_name
-):
+@pytest.mark.parametrize(
+    'scheduler', [{'context': 'test', 'name': 'test'}], indirect=True
+)
+def test_independence(scheduler, execution_number):
     """ Test the independence of tests. This test is run twice with the exact
     same records written. If any records remain after a single test run, the
     second run of this test fails.
@@ -17,17 +16,15 @@ def test_independence(
     This ensures proper separation between tests.
 
     """
-    assert scheduler.context.name == scheduler_context
-    assert scheduler.name == scheduler_name
+    assert scheduler.context.name == 'test'
+    assert scheduler.name == 'test'
 
     scheduler.allocate(
         (datetime(2014, 4, 4, 14, 0), datetime(2014, 4, 4, 15, 0))
     )
     scheduler.commit()
 
-    # note, if this fails for you you probably created your own
-    # scheduler, or cloned an existing one -> those schedulers are for you
-    # to clean up, by calling scheduler.extinguish_managed_records followed
-    # by a commit!
+    # note, the scheduler fixture empties all tables after each test, so
+    # records of other schedulers created during a test are removed as well
     assert scheduler.managed_allocations().count() == 1
     assert scheduler.session.query(Allocation).count() == 1